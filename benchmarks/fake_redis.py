@@ -0,0 +1,22 @@
+"""
+Standalone fakeredis TCP server for multi-process benchmarks.
+
+Run it as its own process so its GIL isn't shared with the load generator:
+
+    python -m benchmarks.fake_redis --port 6390
+"""
+import argparse
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fakeredis server over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    from fakeredis import TcpFakeServer
+
+    args = parse_args()
+    TcpFakeServer((args.host, args.port)).serve_forever()
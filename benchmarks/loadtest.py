@@ -0,0 +1,442 @@
+"""
+Load-testing harness for the Weather API.
+
+Drives a closed-loop workload against main.app (in-process via ASGI, or a
+running server with --target) while the offline OpenWeatherMap simulator
+answers upstream calls. Reports overall RPS and per-route p50/p99 latency and
+can gate on a saved baseline so performance changes can be compared run to run.
+
+Examples:
+
+    # In-process app, fakeredis, mixed workload for 30s with 64 virtual users
+    python -m benchmarks.loadtest --redis fake --scenario mixed --duration 30 --concurrency 64
+
+    # Save a baseline, then fail if a later run regresses by more than 10%
+    python -m benchmarks.loadtest --json baseline.json
+    python -m benchmarks.loadtest --baseline baseline.json --max-regression 0.10
+
+    # Against a running server (start it with OPENWEATHERMAP_URL=http://127.0.0.1:9100)
+    python -m benchmarks.loadtest --target http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from benchmarks.owm_simulator import SimulatorConfig, create_simulator
+
+BENCH_PASSWORD = "bench-password"
+
+# Route weights per scenario. Labels are the route templates used in the report.
+SCENARIOS = {
+    "mixed": {
+        "GET /api/weather/{city}": 40,
+        "GET /api/forecast/{city}": 20,
+        "GET /api/air_pollution/{city}": 10,
+        "GET /api/historical_weather/{city}": 5,
+        "GET /api/uv_index/{city}": 10,
+        "GET /api/map/{city}": 10,
+        "GET /users/me": 3,
+        "POST /token": 2,
+    },
+    "hot": {
+        "GET /api/weather/{city}": 60,
+        "GET /api/forecast/{city}": 25,
+        "GET /api/map/{city}": 15,
+    },
+    "cold": {
+        "GET /api/weather/{city}": 40,
+        "GET /api/forecast/{city}": 20,
+        "GET /api/air_pollution/{city}": 15,
+        "GET /api/historical_weather/{city}": 10,
+        "GET /api/uv_index/{city}": 15,
+    },
+    "auth": {
+        "POST /token": 70,
+        "GET /users/me": 30,
+    },
+    "signup": {
+        "POST /users/": 100,
+    },
+}
+
+
+class CityPicker:
+    """Chooses cities from a Zipf-like hot set, or unique names for cold traffic."""
+
+    def __init__(self, cities: int, skew: float, cold: bool, unknown_rate: float):
+        self.names = [f"city-{i}" for i in range(cities)]
+        self.weights = [1 / (rank ** skew) for rank in range(1, cities + 1)]
+        self.cold = cold
+        self.unknown_rate = unknown_rate
+
+    def pick(self) -> str:
+        if self.unknown_rate and random.random() < self.unknown_rate:
+            return f"nowhere-{uuid.uuid4().hex[:8]}"
+        if self.cold:
+            return f"cold-{uuid.uuid4().hex[:12]}"
+        return random.choices(self.names, weights=self.weights)[0]
+
+
+class Recorder:
+    """Latencies of successful (2xx) responses plus a count of every outcome per route."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def add(self, route: str, status, seconds: float):
+        if not self.recording:
+            return
+        if isinstance(status, int) and 200 <= status < 300:
+            self.latencies[route].append(seconds)
+        self.statuses[route][str(status)] += 1
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    """
+    RPS and latency percentiles count successful responses only, so a change that
+    makes requests fail fast can't look like a speedup. Failures (non-2xx and
+    client exceptions) are reported as error_rate.
+    """
+    routes = {}
+    total = ok = 0
+    overall = []
+    for route, statuses in sorted(recorder.statuses.items()):
+        values = sorted(recorder.latencies[route])
+        requests = sum(statuses.values())
+        total += requests
+        ok += len(values)
+        overall.extend(values)
+        routes[route] = {
+            "requests": requests,
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+            "error_rate": round(1 - len(values) / requests, 4),
+            "statuses": dict(statuses),
+        }
+    overall.sort()
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "rps": round(ok / elapsed, 2),
+        "p50_ms": round(percentile(overall, 50) * 1000, 2),
+        "p99_ms": round(percentile(overall, 99) * 1000, 2),
+        "error_rate": round(1 - ok / total, 4) if total else 0.0,
+        "routes": routes,
+    }
+
+
+def print_report(summary: dict, scenario: str):
+    print(
+        f"\nscenario={scenario} requests={summary['requests']} elapsed={summary['elapsed_s']}s "
+        f"rps={summary['rps']} p50={summary['p50_ms']}ms p99={summary['p99_ms']}ms errors={summary['error_rate']:.2%} "
+        f"client_cpu={summary.get('client_cpu', 0):.0%}"
+    )
+    print(f"{'route':<38} {'reqs':>7} {'ok rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>8}  statuses")
+    for route, stats in summary["routes"].items():
+        statuses = " ".join(f"{code}:{count}" for code, count in sorted(stats["statuses"].items()))
+        print(
+            f"{route:<38} {stats['requests']:>7} {stats['rps']:>9} {stats['p50_ms']:>9} {stats['p99_ms']:>9} "
+            f"{stats['error_rate']:>8.2%}  {statuses}"
+        )
+
+
+def compare_to_baseline(summary: dict, baseline: dict, max_regression: float, max_error_increase: float = 0.0) -> list:
+    """Returns a list of human-readable regressions beyond the allowed ratio."""
+    failures = []
+    if summary["rps"] < baseline["rps"] * (1 - max_regression):
+        failures.append(f"overall rps {summary['rps']} < baseline {baseline['rps']}")
+    if summary["error_rate"] > baseline.get("error_rate", 0.0) + max_error_increase:
+        failures.append(f"overall error rate {summary['error_rate']:.2%} > baseline {baseline.get('error_rate', 0.0):.2%}")
+    for route, base in baseline["routes"].items():
+        current = summary["routes"].get(route)
+        if current is None:
+            continue
+        if current["p99_ms"] > base["p99_ms"] * (1 + max_regression):
+            failures.append(f"{route} p99 {current['p99_ms']}ms > baseline {base['p99_ms']}ms")
+        if current["rps"] < base["rps"] * (1 - max_regression):
+            failures.append(f"{route} rps {current['rps']} < baseline {base['rps']}")
+        if current["error_rate"] > base.get("error_rate", 0.0) + max_error_increase:
+            failures.append(f"{route} error rate {current['error_rate']:.2%} > baseline {base.get('error_rate', 0.0):.2%}")
+    return failures
+
+
+def start_simulator(config: SimulatorConfig, host: str, port: int):
+    """Runs the simulator under uvicorn in a daemon thread with its own event loop."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(create_simulator(config), host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError(f"OpenWeatherMap simulator failed to start on {host}:{port}")
+        time.sleep(0.01)
+    return server, thread
+
+
+async def open_in_process_app(redis_mode: str):
+    """Imports main.app against the simulator and runs its startup hooks."""
+    from dependencies.redis_client import redis_client
+
+    if redis_mode == "fake":
+        import fakeredis.aioredis
+
+        redis_client.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        redis_client.pid = os.getpid()
+
+    from fastapi_limiter import FastAPILimiter
+    from main import app
+
+    await app.router.startup()
+    # Redis connects in the background; without it every request would be uncached and unthrottled
+    deadline = time.monotonic() + 10
+    while not (redis_client.connected and FastAPILimiter.redis is not None):
+        if time.monotonic() > deadline:
+            await app.router.shutdown()
+            raise RuntimeError(
+                "Redis did not connect within 10s, so results would be measured without cache or rate limiting. "
+                "Check REDIS_HOST/REDIS_PORT or use --redis fake."
+            )
+        await asyncio.sleep(0.05)
+    return app
+
+
+def client_headers(token: str = None) -> dict:
+    # fastapi-limiter keys on X-Forwarded-For, so every request looks like a distinct client
+    headers = {"X-Forwarded-For": f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+async def create_users(client, count: int, run_id: str) -> list:
+    users = []
+    for i in range(count):
+        username = f"bench-{run_id}-{i}"
+        response = await client.post("/users/", json={"username": username, "password": BENCH_PASSWORD}, headers=client_headers())
+        response.raise_for_status()
+        response = await client.post("/token", data={"username": username, "password": BENCH_PASSWORD}, headers=client_headers())
+        response.raise_for_status()
+        users.append((username, response.json()["access_token"]))
+    return users
+
+
+async def issue(client, route: str, cities: CityPicker, users: list, run_id: str):
+    method, template = route.split(" ", 1)
+    username, token = random.choice(users)
+
+    if route == "POST /token":
+        return await client.post(template, data={"username": username, "password": BENCH_PASSWORD}, headers=client_headers())
+    if route == "POST /users/":
+        body = {"username": f"bench-{run_id}-{uuid.uuid4().hex[:12]}", "password": BENCH_PASSWORD}
+        return await client.post(template, json=body, headers=client_headers())
+
+    path = template.replace("{city}", cities.pick())
+    params = None
+    if template.startswith("/api/historical_weather/"):
+        params = {"date": f"2024-0{random.randint(1, 9)}-{random.randint(10, 28)}"}
+    return await client.request(method, path, params=params, headers=client_headers(token))
+
+
+async def virtual_user(client, weights: dict, cities: CityPicker, users: list, run_id: str, recorder: Recorder, stop: asyncio.Event):
+    routes, route_weights = list(weights), list(weights.values())
+    while not stop.is_set():
+        route = random.choices(routes, weights=route_weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await issue(client, route, cities, users, run_id)
+            status = response.status_code
+        except Exception as exc:
+            status = type(exc).__name__
+        recorder.add(route, status, time.perf_counter() - started)
+
+
+async def drive(args, ready=None):
+    """
+    Runs one closed-loop load generator. Returns (recorder, elapsed seconds, client CPU),
+    where client CPU is this process's CPU time over the measured window as a fraction
+    of one core; near 1.0 means the load generator, not the server, is the bottleneck.
+    ready, if given, is a blocking callable run after setup (used to line up processes).
+    """
+    import httpx
+
+    app = None
+    if args.target:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency * 2))
+        base_url = args.target
+    else:
+        app = await open_in_process_app(args.redis)
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    stop = asyncio.Event()
+    weights = SCENARIOS[args.scenario]
+    cities = CityPicker(args.cities, args.skew, args.scenario == "cold", args.unknown_rate)
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+            users = await create_users(client, args.users, run_id)
+            if ready is not None:
+                await asyncio.get_running_loop().run_in_executor(None, ready)
+            workers = [
+                asyncio.create_task(virtual_user(client, weights, cities, users, run_id, recorder, stop))
+                for _ in range(args.concurrency)
+            ]
+            await asyncio.sleep(args.warmup)
+            recorder.recording = True
+            started, cpu_started = time.perf_counter(), time.process_time()
+            await asyncio.sleep(args.duration)
+            recorder.recording = False
+            elapsed = time.perf_counter() - started
+            cpu = (time.process_time() - cpu_started) / elapsed
+            stop.set()
+            await asyncio.gather(*workers)
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+
+    return recorder, elapsed, cpu
+
+
+def _client_process(args, barrier, results):
+    recorder, elapsed, cpu = asyncio.run(drive(args, ready=barrier.wait))
+    results.put({
+        "latencies": dict(recorder.latencies),
+        "statuses": {route: dict(statuses) for route, statuses in recorder.statuses.items()},
+        "elapsed": elapsed,
+        "cpu": cpu,
+    })
+
+
+def benchmark(args) -> dict:
+    """
+    Runs the workload and returns its summary. With --processes N (only with --target),
+    the virtual users are split across N load-generator processes so the client's GIL
+    doesn't cap throughput, and their results are merged.
+    """
+    if args.processes <= 1:
+        recorder, elapsed, cpu = asyncio.run(drive(args))
+        summary = summarize(recorder, elapsed)
+        summary["client_cpu"] = round(cpu, 2)
+        return summary
+
+    if not args.target:
+        raise SystemExit("--processes needs --target: the in-process app can't be shared between processes")
+
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(args.processes), ctx.Queue()
+    per_process = argparse.Namespace(**{**vars(args), "concurrency": max(1, args.concurrency // args.processes)})
+    processes = [ctx.Process(target=_client_process, args=(per_process, barrier, results)) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    parts = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    merged = Recorder()
+    for part in parts:
+        for route, values in part["latencies"].items():
+            merged.latencies[route].extend(values)
+        for route, statuses in part["statuses"].items():
+            for status, count in statuses.items():
+                merged.statuses[route][status] += count
+    summary = summarize(merged, max(part["elapsed"] for part in parts))
+    summary["client_cpu"] = round(max(part["cpu"] for part in parts), 2)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Weather API against an offline OpenWeatherMap simulator.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before recording")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent virtual users")
+    parser.add_argument("--processes", type=int, default=1, help="Load-generator processes to split the virtual users across (--target only)")
+    parser.add_argument("--users", type=int, default=10, help="Accounts registered before the run")
+    parser.add_argument("--cities", type=int, default=200, help="Size of the city population")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for city popularity (0 = uniform)")
+    parser.add_argument("--unknown-rate", type=float, default=0.0, help="Fraction of requests for cities that do not geocode")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--target", help="Base URL of a running server; default runs main.app in-process")
+    parser.add_argument("--redis", choices=["fake", "real"], default="fake", help="In-process only: fakeredis or REDIS_HOST")
+    parser.add_argument("--database-url", help="In-process only: database for benchmark accounts (default: a temporary SQLite file)")
+    parser.add_argument("--sim-host", default="127.0.0.1")
+    parser.add_argument("--sim-port", type=int, default=9100)
+    parser.add_argument("--no-simulator", action="store_true", help="Do not start the simulator (one is already running)")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="Write the summary to this file")
+    parser.add_argument("--baseline", help="Summary JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="Allowed fractional regression vs baseline")
+    parser.add_argument(
+        "--max-error-increase", type=float, default=0.0,
+        help="Allowed absolute rise in error rate vs baseline (raise when injecting upstream errors)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not args.no_simulator:
+        start_simulator(
+            SimulatorConfig(
+                latency_ms=args.latency_ms,
+                jitter_ms=args.jitter_ms,
+                error_rate=args.error_rate,
+                throttle_rate=args.throttle_rate,
+            ),
+            args.sim_host,
+            args.sim_port,
+        )
+    # Must be set before services.weather and models are imported by main
+    os.environ.setdefault("OPENWEATHERMAP_URL", f"http://{args.sim_host}:{args.sim_port}")
+
+    # Keep benchmark accounts out of the repository's test.db
+    with tempfile.TemporaryDirectory(prefix="weather-bench-") as tmp:
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp}/bench.db"
+        summary = benchmark(args)
+    print_report(summary, args.scenario)
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(summary, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            failures = compare_to_baseline(summary, json.load(fh), args.max_regression, args.max_error_increase)
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Offline OpenWeatherMap simulator.
+
+Serves every upstream endpoint used by services/weather.py with deterministic,
+city-seeded payloads so the API can be load tested without a real API key or
+network access. Latency, upstream errors and 429 throttling are configurable.
+
+Run standalone:
+
+    python -m benchmarks.owm_simulator --port 9100 --latency-ms 40 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class SimulatorConfig:
+    latency_ms: float = 30.0        # Mean upstream latency
+    jitter_ms: float = 10.0         # Uniform +/- jitter around the mean
+    error_rate: float = 0.0         # Fraction of requests answered with 500
+    throttle_rate: float = 0.0      # Fraction of requests answered with 429
+    unknown_city_prefix: str = "nowhere"  # Cities starting with this are not geocoded
+
+
+def _seed(*parts) -> random.Random:
+    """Stable per-city RNG so repeated calls return identical payloads."""
+    return random.Random(zlib.crc32(":".join(str(p) for p in parts).lower().encode()))
+
+
+def _coords(city: str):
+    rng = _seed("coords", city)
+    return round(rng.uniform(-60, 70), 4), round(rng.uniform(-180, 180), 4)
+
+
+def _conditions(rng: random.Random):
+    return {
+        "temp": round(rng.uniform(-10, 35), 2),
+        "feels_like": round(rng.uniform(-15, 38), 2),
+        "humidity": rng.randint(10, 100),
+        "pressure": rng.randint(980, 1040),
+    }
+
+
+def _weather_desc(rng: random.Random):
+    return [{"id": 800, "main": "Clear", "description": rng.choice(["clear sky", "few clouds", "light rain", "mist"]), "icon": "01d"}]
+
+
+def create_simulator(config: SimulatorConfig = None) -> FastAPI:
+    config = config or SimulatorConfig()
+    sim = FastAPI(title="OpenWeatherMap Simulator")
+    sim.state.config = config
+    sim.state.hits = {}
+
+    @sim.middleware("http")
+    async def upstream_behaviour(request, call_next):
+        cfg = sim.state.config
+        sim.state.hits[request.url.path] = sim.state.hits.get(request.url.path, 0) + 1
+
+        delay = max(0.0, cfg.latency_ms + random.uniform(-cfg.jitter_ms, cfg.jitter_ms)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = random.random()
+        if roll < cfg.throttle_rate:
+            return JSONResponse(
+                status_code=429,
+                content={"cod": 429, "message": "Your account is temporary blocked due to exceeding of requests limitation of your subscription type."},
+            )
+        if roll < cfg.throttle_rate + cfg.error_rate:
+            return JSONResponse(status_code=500, content={"cod": 500, "message": "Internal error"})
+        return await call_next(request)
+
+    @sim.get("/geo/1.0/direct")
+    async def geocoding(q: str, limit: int = 1, appid: str = None):
+        if q.lower().startswith(sim.state.config.unknown_city_prefix):
+            return []
+        lat, lon = _coords(q)
+        return [{"name": q, "lat": lat, "lon": lon, "country": "SM"}][:limit]
+
+    @sim.get("/data/2.5/weather")
+    async def weather(q: str, appid: str = None, units: str = "metric"):
+        if q.lower().startswith(sim.state.config.unknown_city_prefix):
+            return JSONResponse(status_code=404, content={"cod": "404", "message": "city not found"})
+        rng = _seed("weather", q)
+        lat, lon = _coords(q)
+        now = int(time.time())
+        return {
+            "coord": {"lat": lat, "lon": lon},
+            "weather": _weather_desc(rng),
+            "main": _conditions(rng),
+            "visibility": rng.randint(1000, 10000),
+            "wind": {"speed": round(rng.uniform(0, 15), 2), "deg": rng.randint(0, 359)},
+            "clouds": {"all": rng.randint(0, 100)},
+            "dt": now,
+            "sys": {"country": "SM", "sunrise": now - 21600, "sunset": now + 21600},
+            "name": q,
+        }
+
+    @sim.get("/data/2.5/forecast")
+    async def forecast(q: str, appid: str = None, units: str = "metric", cnt: int = 40):
+        if q.lower().startswith(sim.state.config.unknown_city_prefix):
+            return JSONResponse(status_code=404, content={"cod": "404", "message": "city not found"})
+        rng = _seed("forecast", q)
+        lat, lon = _coords(q)
+        now = int(time.time())
+        return {
+            "cnt": cnt,
+            "list": [
+                {
+                    "dt": now + i * 10800,
+                    "main": _conditions(rng),
+                    "weather": _weather_desc(rng),
+                    "clouds": {"all": rng.randint(0, 100)},
+                    "wind": {"speed": round(rng.uniform(0, 15), 2), "deg": rng.randint(0, 359)},
+                    "visibility": rng.randint(1000, 10000),
+                }
+                for i in range(cnt)
+            ],
+            "city": {"name": q, "country": "SM", "coord": {"lat": lat, "lon": lon}},
+        }
+
+    @sim.get("/data/2.5/air_pollution")
+    async def air_pollution(lat: float, lon: float, appid: str = None):
+        rng = _seed("air", lat, lon)
+        return {
+            "coord": {"lat": lat, "lon": lon},
+            "list": [{
+                "dt": int(time.time()),
+                "main": {"aqi": rng.randint(1, 5)},
+                "components": {
+                    key: round(rng.uniform(0, 300), 2)
+                    for key in ("co", "no", "no2", "o3", "so2", "pm2_5", "pm10", "nh3")
+                },
+            }],
+        }
+
+    @sim.get("/data/2.5/onecall/timemachine")
+    async def timemachine(lat: float, lon: float, dt: int, appid: str = None, units: str = "metric"):
+        rng = _seed("history", lat, lon, dt)
+        current = _conditions(rng)
+        current.update({
+            "dt": dt,
+            "weather": _weather_desc(rng),
+            "wind_speed": round(rng.uniform(0, 15), 2),
+            "wind_deg": rng.randint(0, 359),
+            "clouds": rng.randint(0, 100),
+            "visibility": rng.randint(1000, 10000),
+        })
+        return {"lat": lat, "lon": lon, "current": current}
+
+    @sim.get("/data/2.5/uvi")
+    async def uv_index(lat: float, lon: float, appid: str = None):
+        rng = _seed("uvi", lat, lon)
+        return {"lat": lat, "lon": lon, "date": int(time.time()), "value": round(rng.uniform(0, 11), 2)}
+
+    @sim.get("/_sim/stats")
+    async def stats():
+        return {"hits": sim.state.hits}
+
+    return sim
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline OpenWeatherMap simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    args = parse_args()
+    uvicorn.run(
+        create_simulator(SimulatorConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+        )),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
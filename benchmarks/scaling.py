@@ -0,0 +1,162 @@
+"""
+Throughput scaling benchmark across worker counts.
+
+Starts the OpenWeatherMap simulator and a shared Redis (fakeredis TCP server by
+default) as separate processes, then for each worker count launches the
+production server, drives the load-test workload against it from several
+load-generator processes and reports how RPS and latency scale.
+
+The fakeredis server is single-threaded Python and tops out at a few thousand
+ops/s; use --redis real for high worker counts. The client_cpu column shows how
+busy the busiest load-generator process was: near 100% means the numbers
+measure the harness, not the app, so add --client-processes.
+
+    python -m benchmarks.scaling --workers 1 2 4 8 --scenario hot --duration 20
+    python -m benchmarks.scaling --server uvicorn --redis real   # uses REDIS_HOST/REDIS_PORT
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks import loadtest
+from server import cpu_count
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_helper(module: str, host: str, port: int, *extra) -> subprocess.Popen:
+    """Runs a benchmarks helper (simulator, fake Redis) in its own process and waits for its port."""
+    process = subprocess.Popen([sys.executable, "-m", module, "--host", host, "--port", str(port), *extra], cwd=ROOT)
+    deadline = time.monotonic() + 15
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"{module} exited with code {process.returncode}")
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return process
+        except OSError:
+            if time.monotonic() > deadline:
+                stop(process)
+                raise RuntimeError(f"{module} not listening on {host}:{port}")
+            time.sleep(0.1)
+
+
+def launch(server: str, workers: int, host: str, port: int, env: dict) -> subprocess.Popen:
+    if server == "gunicorn":
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-w", str(workers), "--bind", f"{host}:{port}", "main:app"]
+    else:
+        command = [sys.executable, "server.py", "--workers", str(workers), "--host", host, "--port", str(port)]
+    return subprocess.Popen(command, cwd=ROOT, env=env)
+
+
+def wait_ready(process: subprocess.Popen, url: str, timeout: float = 30.0):
+    """Waits until /readyz reports "ok", i.e. the database and Redis (cache + rate limiter) are up."""
+    deadline = time.monotonic() + timeout
+    last = None
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before becoming ready")
+        try:
+            last = httpx.get(url, timeout=2.0).json()
+            if last.get("status") == "ok":
+                return
+        except (httpx.HTTPError, ValueError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(
+        f"Server not ready after {timeout}s (last {url}: {last}). Refusing to benchmark "
+        "a degraded server, which would run without cache or rate limiting."
+    )
+
+
+def stop(process: subprocess.Popen, timeout: float = 40.0):
+    """SIGTERM for a graceful shutdown, SIGKILL if the server does not exit in time."""
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Weather API throughput across worker counts.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"], default="gunicorn")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--redis", choices=["fake", "real"], default="fake")
+    parser.add_argument("--redis-port", type=int, default=6390, help="Port for the fakeredis TCP server")
+    parser.add_argument("--database-url", help="Database for the servers under test (default: a temporary SQLite file)")
+    parser.add_argument("--scenario", choices=sorted(loadtest.SCENARIOS), default="hot")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--client-processes", type=int, default=min(4, cpu_count()), help="Load-generator processes")
+    parser.add_argument("--sim-port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    helpers = [start_helper("benchmarks.owm_simulator", args.host, args.sim_port, "--latency-ms", str(args.latency_ms))]
+    env = dict(os.environ, OPENWEATHERMAP_URL=f"http://{args.host}:{args.sim_port}")
+    try:
+        if args.redis == "fake":
+            helpers.append(start_helper("benchmarks.fake_redis", args.host, args.redis_port))
+            env.update(REDIS_HOST=args.host, REDIS_PORT=str(args.redis_port))
+        results = run_all(args, env)
+    finally:
+        for helper in helpers:
+            stop(helper, timeout=5)
+
+    base_rps = results[0][1]["rps"] or 1
+    print(f"\nserver={args.server} scenario={args.scenario} concurrency={args.concurrency} cpus={cpu_count()} redis={args.redis}")
+    print(f"{'workers':>7} {'rps':>10} {'speedup':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>8} {'client cpu':>11}")
+    for workers, summary in results:
+        print(
+            f"{workers:>7} {summary['rps']:>10} {summary['rps'] / base_rps:>7.2f}x {summary['p50_ms']:>9} "
+            f"{summary['p99_ms']:>9} {summary['error_rate']:>8.2%} {summary['client_cpu']:>11.0%}"
+        )
+    if any(summary["client_cpu"] > 0.9 for _, summary in results):
+        print("WARNING: a load-generator process was CPU-saturated; raise --client-processes before trusting these rows")
+
+
+def run_all(args, env: dict) -> list:
+    target = f"http://{args.host}:{args.port}"
+    results = []
+    # Keep benchmark accounts out of the repository's test.db
+    with tempfile.TemporaryDirectory(prefix="weather-bench-") as tmp:
+        env["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp}/bench.db"
+        for workers in args.workers:
+            process = launch(args.server, workers, args.host, args.port, env)
+            try:
+                wait_ready(process, f"{target}/readyz")
+                summary = loadtest.benchmark(loadtest.parse_args([
+                    "--target", target,
+                    "--no-simulator",
+                    "--scenario", args.scenario,
+                    "--duration", str(args.duration),
+                    "--warmup", str(args.warmup),
+                    "--concurrency", str(args.concurrency),
+                    "--processes", str(args.client_processes),
+                ]))
+            finally:
+                stop(process)
+            results.append((workers, summary))
+            print(f"workers={workers} rps={summary['rps']} p50={summary['p50_ms']}ms p99={summary['p99_ms']}ms client_cpu={summary['client_cpu']:.0%}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
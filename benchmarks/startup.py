@@ -0,0 +1,120 @@
+"""
+Startup-time profile for the Weather API.
+
+1. Runs `python -X importtime -c "import main"` in a fresh interpreter and
+   reports total import time plus the most expensive packages.
+2. Launches uvicorn and measures the time until /healthz answers, with Redis
+   pointed at an unreachable address by default to check the app still comes
+   up (degraded) instead of crash-looping.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 5 --top 15 --redis-host localhost
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module: str) -> list:
+    """(self_us, cumulative_us, name) rows from -X importtime, in import order."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def by_package(rows: list) -> dict:
+    """Self time summed per top-level package."""
+    totals = defaultdict(int)
+    for self_us, _, name in rows:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+
+def launch_uvicorn(port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_for(process: subprocess.Popen, url: str, timeout: float = 30.0) -> httpx.Response:
+    """Polls url until it answers 200, failing if the server exits first."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode} during startup")
+        try:
+            response = httpx.get(url, timeout=0.5)
+            if response.status_code == 200:
+                return response
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def time_to_healthy(port: int, env: dict) -> float:
+    """Seconds from launching uvicorn until /healthz returns 200."""
+    started = time.perf_counter()
+    process = launch_uvicorn(port, env)
+    try:
+        wait_for(process, f"http://127.0.0.1:{port}/healthz")
+        return time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Profile Weather API import and startup time.")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions; the median is reported")
+    parser.add_argument("--top", type=int, default=10, help="Packages to list")
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--redis-host", default="127.0.0.1")
+    parser.add_argument("--redis-port", type=int, default=1, help="Default is unreachable, to test degraded startup")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    totals = [next(cum for _, cum, name in rows if name == args.module) for rows in profiles]
+    print(f"import {args.module}: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+
+    packages = by_package(profiles[-1])
+    print(f"\n{'package':<24} {'self ms':>9}")
+    for name, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<24} {self_us / 1000:>9.1f}")
+
+    env = dict(os.environ, REDIS_HOST=args.redis_host, REDIS_PORT=str(args.redis_port))
+    timings = [time_to_healthy(args.port, env) for _ in range(args.runs)]
+    print(f"\ntime to /healthz (REDIS_HOST={args.redis_host}:{args.redis_port}): median {statistics.median(timings) * 1000:.0f} ms")
+
+    process = launch_uvicorn(args.port, env)
+    try:
+        print(f"/readyz: {wait_for(process, f'http://127.0.0.1:{args.port}/readyz').json()}")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
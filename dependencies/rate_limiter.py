@@ -1,3 +1,25 @@
+from fastapi import HTTPException, Request, Response
+from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
 
-rate_limiter = RateLimiter(times=10, seconds=60)  # Example rate limiter: 10 requests per minute
+from dependencies.redis_client import redis_client
+
+
+class OptionalRateLimiter(RateLimiter):
+    """RateLimiter that lets requests through while Redis is connecting or unreachable (degraded mode)."""
+
+    async def __call__(self, request: Request, response: Response):
+        if FastAPILimiter.redis is None:
+            return
+        try:
+            result = await super().__call__(request, response)
+        except HTTPException:
+            raise  # 429 Too Many Requests
+        except Exception as e:
+            redis_client.mark_failed(e)
+            return
+        redis_client.mark_ok()
+        return result
+
+
+rate_limiter = OptionalRateLimiter(times=10, seconds=60)  # Example rate limiter: 10 requests per minute
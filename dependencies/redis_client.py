@@ -1,8 +1,10 @@
+import asyncio
+import logging
 import os
-import aioredis
 from dotenv import load_dotenv
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 class RedisClient:
     _instance = None
@@ -11,11 +13,17 @@ class RedisClient:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.redis_client = None
+            cls._instance.pid = None
+            cls._instance.failing = False
         return cls._instance
 
     async def init(self):
-        if self.redis_client is not None:
-            return  # Redis is already initialized
+        if self.connected:
+            return  # Redis is already initialized in this process
+
+        # A client inherited across fork shares sockets with the parent; build a per-worker pool instead
+        self.redis_client = None
+        self.pid = None
 
         redis_host = os.getenv("REDIS_HOST", "redis")
         redis_port = int(os.getenv("REDIS_PORT", 6379))
@@ -23,25 +31,103 @@ class RedisClient:
         redis_password = os.getenv("REDIS_PASSWORD", None)
 
         try:
-            self.redis_client = await aioredis.from_url(
+            import aioredis  # Deferred so importing the app doesn't pay for the Redis client
+        except Exception as e:
+            # e.g. aioredis 2.0.1 on Python 3.11+ fails with "duplicate base class TimeoutError"
+            raise ImportError(f"aioredis could not be imported: {e!r}") from e
+
+        client = None
+        try:
+            client = await aioredis.from_url(
                 f"redis://{redis_host}:{redis_port}/{redis_db}",
                 password=redis_password,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=True,
+                socket_connect_timeout=5,
             )
-            await self.redis_client.ping()  # Test the connection
+            await client.ping()  # Test the connection
 
-        except Exception as e:
-            print(f"Error initializing Redis: {e}")
+        except Exception:
+            if client is not None:
+                await client.close()
             raise
 
-    async def get_client(self):
-        if self.redis_client is None:
-            await self.init()
+        self.redis_client = client
+        self.pid = os.getpid()
+
+    async def connect_with_retry(self, on_connect=None, max_delay: float = 30.0):
+        """
+        Keep trying to connect with exponential backoff, then run on_connect(client).
+
+        Started as a background task at startup so the app can serve (uncached)
+        traffic while Redis is unreachable instead of failing to boot. A broken
+        aioredis install is not retried: it raises ImportError after logging.
+        """
+        delay = 1.0
+        while True:
+            try:
+                await self.init()
+                if on_connect is not None:
+                    await on_connect(self.redis_client)
+                logger.info("Connected to Redis")
+                self.mark_ok()
+                return
+            except ImportError as e:
+                logger.error("Redis disabled, serving uncached and without rate limiting: %s", e)
+                raise
+            except Exception as e:
+                logger.warning("Error initializing Redis: %r; retrying in %.0fs", e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+    @property
+    def connected(self) -> bool:
+        return self.redis_client is not None and self.pid == os.getpid()
+
+    def mark_failed(self, error: Exception):
+        """Record a failed Redis call. Only the transition to failing is logged, not every request."""
+        if not self.failing:
+            self.failing = True
+            logger.warning("Redis unavailable, serving uncached and without rate limiting: %r", error)
 
-        if self.redis_client is None:
-            raise RuntimeError("Redis client initialization failed.")
+    def mark_ok(self):
+        if self.failing:
+            self.failing = False
+            logger.info("Redis available again")
+
+    async def ping(self, timeout: float = 1.0) -> bool:
+        """True if Redis answers a PING within timeout seconds."""
+        if not self.connected:
+            return False
+        try:
+            return bool(await asyncio.wait_for(self.redis_client.ping(), timeout))
+        except Exception:
+            return False
+
+    async def get_cached(self, key: str):
+        """Cached value for key, or None if Redis is unavailable (requests are then served uncached)."""
+        if not self.connected:
+            return None
+        try:
+            value = await self.redis_client.get(key)
+        except Exception as e:
+            self.mark_failed(e)
+            return None
+        self.mark_ok()
+        return value
+
+    async def set_cached(self, key: str, seconds: int, value: str):
+        if not self.connected:
+            return
+        try:
+            await self.redis_client.setex(key, seconds, value)
+        except Exception as e:
+            self.mark_failed(e)
 
-        return self.redis_client
+    async def close(self):
+        if self.connected:
+            await self.redis_client.close()
+        self.redis_client = None
+        self.pid = None
 
 redis_client = RedisClient()
@@ -0,0 +1,24 @@
+# Gunicorn settings for multi-worker deployments: gunicorn -c gunicorn.conf.py main:app
+import os
+
+from server import GRACEFUL_TIMEOUT, default_workers, prepare_master
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', 8000)}"
+workers = default_workers()
+worker_class = "workers.UvloopWorker"
+graceful_timeout = GRACEFUL_TIMEOUT
+timeout = int(os.getenv("WORKER_TIMEOUT", 60))
+keepalive = 5
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def on_starting(server):
+    # Runs once in the master before any worker is forked
+    prepare_master()
+
+
+def post_fork(server, worker):
+    # Drop any database connections copied from the master; the worker opens its own
+    from models import engine
+
+    engine.dispose(close=False)
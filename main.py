@@ -1,8 +1,14 @@
+import asyncio
+import os
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from routers.weather import router as weather_router
 from routers.auth import router as auth_router
 from dependencies.redis_client import redis_client
 from fastapi_limiter import FastAPILimiter
+from models import engine, init_db
 app = FastAPI(
     title="Weather API",
     description="This FastAPI application provides comprehensive weather data services, including current weather conditions, forecasts, air pollution metrics, historical weather data, UV index information, and geographical mapping. The application features authentication and authorization using SQLite, employs caching mechanisms with Redis to enhance performance, and implements rate limiting to manage API request rates effectively.",
@@ -21,18 +27,59 @@ def read_root():
 
 
 
-# Initialize Redis client during startup
-@app.on_event("startup")
-async def startup_event():
+@app.get("/healthz", tags=["health"])
+def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz", tags=["health"])
+async def readiness():
+    """
+    Readiness probe. Returns 503 if the database is unreachable. Redis is optional:
+    while it is down the API serves uncached, unthrottled traffic and reports "degraded".
+    """
     try:
-        await redis_client.init()
-        await FastAPILimiter.init(redis=redis_client.redis_client)  # Initialize FastAPILimiter with redis client
+        await run_in_threadpool(check_database)
     except Exception as e:
-        print(f"Error initializing Redis or FastAPILimiter: {e}")
-        raise
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database": str(e)})
+
+    redis_ok = await redis_client.ping(timeout=1.0)
+    return {
+        "status": "ok" if redis_ok else "degraded",
+        "database": "ok",
+        "redis": "connected" if redis_ok else "unavailable",
+    }
+
+
+def check_database():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def init_rate_limiter(client):
+    await FastAPILimiter.init(redis=client)  # Initialize FastAPILimiter with redis client
+
+
+# Runs in every worker, after fork
+@app.on_event("startup")
+async def startup_event():
+    # Multi-worker launchers create the schema once before forking and set this flag
+    if not os.getenv("WEATHER_API_SCHEMA_READY"):
+        init_db()
+    # Connect to Redis in the background so an unreachable Redis doesn't stop the app from starting
+    app.state.redis_task = asyncio.create_task(redis_client.connect_with_retry(on_connect=init_rate_limiter))
 
 # Handle cleanup during shutdown
 @app.on_event("shutdown")
 async def shutdown_event():
-    if redis_client.redis_client:
-        await redis_client.redis_client.close()
+    # Missing if startup failed before the task was created
+    redis_task = getattr(app.state, "redis_task", None)
+    if redis_task is not None:
+        redis_task.cancel()
+        try:
+            await redis_task
+        except (asyncio.CancelledError, ImportError):
+            pass  # An ImportError was already logged by connect_with_retry
+    await redis_client.close()
+    engine.dispose()
@@ -36,15 +36,14 @@ async def get_weather(city: str, current_user: User = Depends(get_current_user))
     """
 
     try:
-        client = await redis_client.get_client()
         cache_key = f"weather:{city}"
-        cached_data = await client.get(cache_key)
+        cached_data = await redis_client.get_cached(cache_key)
         
         if cached_data:
             return JSONResponse(content=json.loads(cached_data))
 
         weather_data = await fetch_weather(city)
-        await client.setex(cache_key, 300, json.dumps(weather_data))  # Cache for 300 seconds
+        await redis_client.set_cached(cache_key, 300, json.dumps(weather_data))  # Cache for 300 seconds
         return JSONResponse(content=weather_data)
 
     except Exception as e:
@@ -68,15 +67,14 @@ async def get_forecast(city: str, current_user: User = Depends(get_current_user)
     """
 
     try:
-        client = await redis_client.get_client()
         cache_key = f"forecast:{city}"
-        cached_data = await client.get(cache_key)
+        cached_data = await redis_client.get_cached(cache_key)
         
         if cached_data:
             return JSONResponse(content=json.loads(cached_data))
 
         forecast_data = await fetch_forecast(city)
-        await client.setex(cache_key, 300, json.dumps(forecast_data))  # Cache for 300 seconds
+        await redis_client.set_cached(cache_key, 300, json.dumps(forecast_data))  # Cache for 300 seconds
         return JSONResponse(content=forecast_data)
 
     except Exception as e:
@@ -99,15 +97,14 @@ async def get_air_pollution(city: str, current_user: User = Depends(get_current_
     - HTTPException: If an error occurs while fetching or caching the air pollution data.
     """
     try:
-        client = await redis_client.get_client()
         cache_key = f"air_pollution:{city}"
-        cached_data = await client.get(cache_key)
+        cached_data = await redis_client.get_cached(cache_key)
         
         if cached_data:
             return JSONResponse(content=json.loads(cached_data))
 
         air_pollution_data = await fetch_air_pollution(city)
-        await client.setex(cache_key, 300, json.dumps(air_pollution_data))  # Cache for 300 seconds
+        await redis_client.set_cached(cache_key, 300, json.dumps(air_pollution_data))  # Cache for 300 seconds
         return JSONResponse(content=air_pollution_data)
 
     except Exception as e:
@@ -136,15 +133,14 @@ async def get_historical_weather(city: str, date: str = Query(..., description="
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
 
     try:
-        client = await redis_client.get_client()
         cache_key = f"historical_weather:{city}:{timestamp}"
-        cached_data = await client.get(cache_key)
+        cached_data = await redis_client.get_cached(cache_key)
         
         if cached_data:
             return JSONResponse(content=json.loads(cached_data))
 
         historical_weather_data = await fetch_historical_weather(city, timestamp)
-        await client.setex(cache_key, 300, json.dumps(historical_weather_data))  # Cache for 300 seconds
+        await redis_client.set_cached(cache_key, 300, json.dumps(historical_weather_data))  # Cache for 300 seconds
         return JSONResponse(content=historical_weather_data)
 
     except Exception as e:
@@ -174,15 +170,14 @@ async def get_uv_index(city: str, current_user: User = Depends(get_current_user)
         raise HTTPException(status_code=exc.status_code, detail=exc.detail)
     
     try:
-        client = await redis_client.get_client()
         cache_key = f"uv_index:{lat}:{lon}"
-        cached_data = await client.get(cache_key)
+        cached_data = await redis_client.get_cached(cache_key)
         
         if cached_data:
             return JSONResponse(content=json.loads(cached_data))
 
         uv_index_data = await fetch_uv_index(lat, lon)
-        await client.setex(cache_key, 300, json.dumps(uv_index_data))  # Cache for 300 seconds
+        await redis_client.set_cached(cache_key, 300, json.dumps(uv_index_data))  # Cache for 300 seconds
         return JSONResponse(content=uv_index_data)
 
     except Exception as e:
@@ -209,9 +204,8 @@ async def get_map(city: str, current_user: User = Depends(get_current_user)):
     - HTTPException: If an error occurs while fetching or caching the map data.
     """
     try:
-        client = await redis_client.get_client()
         cache_key = f"map:{city}"
-        cached_data = await client.get(cache_key)
+        cached_data = await redis_client.get_cached(cache_key)
         
         if cached_data:
             return JSONResponse(content=json.loads(cached_data))
@@ -219,7 +213,7 @@ async def get_map(city: str, current_user: User = Depends(get_current_user)):
         lat, lon = await fetch_coordinates(city)
         response_data = {"city": city, "latitude": lat, "longitude": lon}
 
-        await client.setex(cache_key, 300, json.dumps(response_data))  # Cache for 300 seconds
+        await redis_client.set_cached(cache_key, 300, json.dumps(response_data))  # Cache for 300 seconds
         return JSONResponse(content=response_data)
 
     except HTTPException as exc:
@@ -0,0 +1,93 @@
+"""
+Production entry point for running the API with several worker processes.
+
+    python server.py --workers 4            # uvicorn's own process manager
+    gunicorn -c gunicorn.conf.py main:app   # gunicorn with uvicorn workers
+
+Both paths create the database schema once in the parent before workers start,
+run every worker on uvloop + httptools (workers.UvloopWorker for gunicorn), and
+let each worker open its own Redis and database connections in the startup hook.
+"""
+import argparse
+import math
+import os
+
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+
+
+def cgroup_cpu_limit(root: str = "/sys/fs/cgroup"):
+    """
+    CPU limit from the cgroup CFS quota (what Docker --cpus and Kubernetes CPU
+    limits set), rounded up to whole CPUs. None if there is no quota.
+    """
+    try:
+        with open(os.path.join(root, "cpu.max")) as fh:  # cgroup v2: "<quota> <period>" or "max <period>"
+            quota, period = fh.read().split()[:2]
+        if quota == "max":
+            return None
+        quota, period = int(quota), int(period)
+    except (OSError, ValueError):
+        try:  # cgroup v1
+            with open(os.path.join(root, "cpu", "cpu.cfs_quota_us")) as fh:
+                quota = int(fh.read())
+            with open(os.path.join(root, "cpu", "cpu.cfs_period_us")) as fh:
+                period = int(fh.read())
+        except (OSError, ValueError):
+            return None
+        if quota <= 0:  # -1 means unlimited
+            return None
+    return max(1, math.ceil(quota / period))
+
+
+def cpu_count() -> int:
+    """CPUs available to this process: the smaller of the CPU affinity set and the cgroup CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY if set, otherwise one worker per available CPU."""
+    if os.getenv("WEB_CONCURRENCY"):
+        return max(1, int(os.getenv("WEB_CONCURRENCY")))
+    return cpu_count()
+
+
+def prepare_master():
+    """Pre-fork setup: create the schema once and tell workers not to repeat it."""
+    from models import engine, init_db
+
+    init_db()
+    engine.dispose()  # Don't hand the parent's SQLite connections to forked workers
+    os.environ["WEATHER_API_SCHEMA_READY"] = "1"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Weather API with multiple uvicorn workers.")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import uvicorn
+
+    args = parse_args(argv)
+    prepare_master()
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,22 @@
 import datetime
 from fastapi import HTTPException
 import os
-import httpx
 from dotenv import load_dotenv
+# httpx is imported inside the fetch functions (as jose/passlib are in services/auth.py) to keep startup fast
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
-BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
-FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
-AIR_POLLUTION_URL = "http://api.openweathermap.org/data/2.5/air_pollution"
-HISTORICAL_WEATHER_URL = "http://api.openweathermap.org/data/2.5/onecall/timemachine"
-UV_INDEX_URL = "http://api.openweathermap.org/data/2.5/uvi"
-GEOCODING_URL = "http://api.openweathermap.org/geo/1.0/direct"
+# Optional upstream override (e.g. the offline simulator in benchmarks/owm_simulator.py)
+OPENWEATHERMAP_URL = os.getenv("OPENWEATHERMAP_URL", "").rstrip("/")
+HTTPS_HOST = OPENWEATHERMAP_URL or "https://api.openweathermap.org"
+HTTP_HOST = OPENWEATHERMAP_URL or "http://api.openweathermap.org"
+BASE_URL = f"{HTTPS_HOST}/data/2.5/weather"
+FORECAST_URL = f"{HTTPS_HOST}/data/2.5/forecast"
+AIR_POLLUTION_URL = f"{HTTP_HOST}/data/2.5/air_pollution"
+HISTORICAL_WEATHER_URL = f"{HTTP_HOST}/data/2.5/onecall/timemachine"
+UV_INDEX_URL = f"{HTTP_HOST}/data/2.5/uvi"
+GEOCODING_URL = f"{HTTP_HOST}/geo/1.0/direct"
 API_K = os.getenv("API")
 
 
@@ -124,6 +128,7 @@ def format_uv_index_data(data):
     }
 
 async def fetch_weather(city: str):
+    import httpx
     params = {
         "q": city,
         "appid": API_KEY,
@@ -143,6 +148,7 @@ async def fetch_weather(city: str):
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {exc}")
 
 async def fetch_forecast(city: str):
+    import httpx
     params = {
         "q": city,
         "appid": API_KEY,
@@ -163,6 +169,7 @@ async def fetch_forecast(city: str):
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {exc}")
 
 async def fetch_air_pollution(city: str):
+    import httpx
     try:
         lat, lon = await fetch_coordinates(city)
     except HTTPException as exc:
@@ -188,6 +195,7 @@ async def fetch_air_pollution(city: str):
 
 
 async def fetch_coordinates(city: str):
+    import httpx
     params = {
         "q": city,
         "limit": 1,
@@ -211,6 +219,7 @@ async def fetch_coordinates(city: str):
 
 
 async def fetch_uv_index(lat: float, lon: float):
+    import httpx
     params = {
         "lat": lat,
         "lon": lon,
@@ -235,6 +244,7 @@ async def fetch_uv_index(lat: float, lon: float):
 
 # Function to fetch historical weather data
 async def fetch_historical_weather(city: str, timestamp: int):
+    import httpx
     try:
         city_lat, city_lon = await fetch_coordinates(city)
     except HTTPException as exc:
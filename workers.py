@@ -0,0 +1,7 @@
+from uvicorn_worker import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    """Gunicorn worker pinned to uvloop and httptools instead of uvicorn's "auto" detection."""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}